@@ -7,20 +7,158 @@ Returns structured JSON with file contents for token-efficient analysis.
 """
 
 import argparse
+import base64
+import hashlib
 import json
+import os
 import sys
+import time
+import http.client
+import threading
 import urllib.request
-import urllib.error
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import unquote, urljoin, urlsplit
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from pathlib import Path
 import re
+from detect_context import ProjectContextDetector, _suffix
+
+# Optional: orjson (pip install orjson) parses and serializes JSON several times faster
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    orjson = None
+    _json_loads = json.loads
+
+
+def write_json(data: Any, indent: bool = True):
+    """Write data to stdout as JSON (indented, or one compact line for JSON Lines)."""
+    if orjson is None:
+        print(json.dumps(data, indent=2) if indent else json.dumps(data), flush=not indent)
+        return
+    sys.stdout.flush()
+    sys.stdout.buffer.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0) + b'\n')
+    sys.stdout.buffer.flush()
+
+
+# One alternative of a pure extension filter, e.g. ".*\.py$", "\.tsx?$"
+_SUFFIX_PATTERN = re.compile(r'(?:\^?\.\*)?\\\.([A-Za-z0-9_-]+?)([A-Za-z0-9_-]\?)?\$')
+
+
+def _extract_literal_suffixes(pattern: str) -> Optional[tuple]:
+    r"""
+    Return lowercase suffixes equivalent to a pure extension regex, else None.
+
+    ".*\.py$" -> ('.py',); "\.tsx?$" -> ('.ts', '.tsx'); "\.py$|\.js$" -> ('.py', '.js')
+    """
+    suffixes = []
+    for alternative in pattern.split('|'):
+        match = _SUFFIX_PATTERN.fullmatch(alternative)
+        if not match:
+            return None
+        stem, optional = match.group(1), match.group(2)
+        suffixes.append(f".{stem}".lower())
+        if optional:
+            suffixes.append(f".{stem}{optional[0]}".lower())
+    return tuple(suffixes)
+
+
+class _HTTPSConnectionPool:
+    """
+    Thread-safe pool of keep-alive HTTPS connections, one idle list per host.
+
+    Honors HTTPS_PROXY / NO_PROXY like urllib: proxied hosts are reached
+    through a CONNECT tunnel on a connection to the proxy.
+    """
+
+    def __init__(self, timeout: int = 10):
+        self.timeout = timeout
+        self._idle: Dict[str, List[http.client.HTTPSConnection]] = {}
+        self._lock = threading.Lock()
+        self._proxy = urllib.request.getproxies().get('https')
+
+    def _connect(self, host: str) -> http.client.HTTPSConnection:
+        """Open a new connection to host, tunnelling through the HTTPS proxy if configured."""
+        if not self._proxy or urllib.request.proxy_bypass(host):
+            return http.client.HTTPSConnection(host, timeout=self.timeout)
+
+        proxy = urlsplit(self._proxy if '://' in self._proxy else f"http://{self._proxy}")
+        tunnel_headers = {}
+        if proxy.username:
+            credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+            tunnel_headers['Proxy-Authorization'] = f"Basic {base64.b64encode(credentials.encode()).decode()}"
+        conn = http.client.HTTPSConnection(proxy.hostname, proxy.port, timeout=self.timeout)
+        conn.set_tunnel(host, headers=tunnel_headers)
+        return conn
+
+    def _acquire(self, host: str) -> Tuple[http.client.HTTPSConnection, bool]:
+        """Return (connection, reused) for host."""
+        with self._lock:
+            idle = self._idle.get(host)
+            if idle:
+                return idle.pop(), True
+        return self._connect(host), False
+
+    def _release(self, host: str, conn: http.client.HTTPSConnection):
+        with self._lock:
+            self._idle.setdefault(host, []).append(conn)
+
+    def request(self, method: str, url: str, headers: Dict[str, str],
+                body: Optional[bytes] = None) -> tuple[int, str, Dict[str, str], bytes]:
+        """
+        Issue a request, reusing an idle connection to the host if available.
+
+        Returns:
+            Tuple of (status, reason, headers, body)
+        """
+        parts = urlsplit(url)
+        path = parts.path + (f"?{parts.query}" if parts.query else '')
+
+        # Retry once on a fresh connection if the server closed an idle one
+        while True:
+            conn, reused = self._acquire(parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                content = response.read()
+            except (http.client.HTTPException, OSError):
+                # OSError covers timeouts, refused connections and ssl.SSLError
+                conn.close()
+                if not reused:
+                    raise
+                continue
+
+            if response.will_close:
+                conn.close()
+            else:
+                self._release(parts.netloc, conn)
+            return response.status, response.reason, dict(response.getheaders()), content
+
+    def close(self):
+        """Close all idle connections."""
+        with self._lock:
+            for conns in self._idle.values():
+                for conn in conns:
+                    conn.close()
+            self._idle.clear()
 
 
 class GitHubRepoFetcher:
-    """Fetches GitHub repository content via API without disk operations."""
+    """Fetches GitHub repository content via API without cloning."""
 
     RAW_URL_BASE = "https://raw.githubusercontent.com"
     API_URL_BASE = "https://api.github.com"
+    GRAPHQL_URL = f"{API_URL_BASE}/graphql"
+    GRAPHQL_BATCH_SIZE = 50  # Files per GraphQL query
+    USER_AGENT = "github-reader-skill"
+    MAX_REDIRECTS = 5
+
+    # On-disk response cache (revalidated with ETag / If-None-Match)
+    CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME', Path.home() / '.cache')) / 'github-reader'
+    CACHE_TTL = 300  # Seconds a cached response is served without revalidation
+    CACHE_MAX_BYTES = 20 * 1024 * 1024  # Least recently used entries are evicted beyond this
+    _cache_lock = threading.Lock()
 
     # Key files to always fetch for repository understanding
     KEY_FILES = [
@@ -30,25 +168,35 @@ class GitHubRepoFetcher:
         ".gitignore", "LICENSE", "Makefile", "Dockerfile"
     ]
 
+    # Concurrent downloads (requests are latency-bound, not CPU-bound)
+    MAX_WORKERS = 8
+
     # Priority directories for examples and usage patterns
-    PRIORITY_DIRS = {
+    PRIORITY_DIRS = frozenset({
         "examples", "example", "demos", "demo", "samples", "sample",
         "tutorials", "tutorial", "quickstart", "getting-started",
         "snippets", "cookbook", "recipes", "docs/examples"
-    }
+    })
 
     # Directories to skip for efficiency
-    SKIP_DIRS = {
+    SKIP_DIRS = frozenset({
         "node_modules", ".git", "vendor", "dist", "build",
         "__pycache__", ".next", "out", "coverage", ".pytest_cache",
         "target", "bin", "obj", ".vscode", ".idea"
-    }
+    })
 
-    def __init__(self, repo_url: str, branch: str = "main"):
-        """Initialize fetcher with repository URL."""
+    def __init__(self, repo_url: str, branch: Optional[str] = None, use_cache: bool = True):
+        """Initialize fetcher with repository URL (branch defaults to the repo's default branch)."""
         self.repo_url = repo_url.rstrip('/')
         self.owner, self.repo = self._parse_repo_url(repo_url)
         self.branch = branch
+        self.use_cache = use_cache
+        # Optional token enables batched GraphQL file fetches
+        self.token = os.environ.get('GITHUB_TOKEN') or os.environ.get('GH_TOKEN')
+        self._entries_cache: Optional[Tuple[Dict[str, Any], List[tuple]]] = None
+        # Bytes written since the last prune; None until the first write prunes
+        self._cache_written: Optional[int] = None
+        self._pool = _HTTPSConnectionPool(timeout=10)
 
     def _parse_repo_url(self, url: str) -> tuple[str, str]:
         """Extract owner and repo name from GitHub URL."""
@@ -59,41 +207,309 @@ class GitHubRepoFetcher:
             raise ValueError(f"Invalid GitHub URL: {url}")
         return match.group(1), match.group(2)
 
+    def _cache_path(self, url: str) -> Path:
+        """Return cache file path for a URL."""
+        return self.CACHE_DIR / f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.json"
+
+    def _is_immutable(self, url: str) -> bool:
+        """Raw file URLs pinned to a commit SHA never change."""
+        return url.startswith(self.RAW_URL_BASE) and re.fullmatch(r'[0-9a-f]{40}', self.branch or '') is not None
+
+    def _read_cache(self, url: str) -> Optional[Dict[str, Any]]:
+        """Load cached response entry, or None if missing/unreadable."""
+        if not self.use_cache:
+            return None
+        path = self._cache_path(url)
+        try:
+            with open(path, 'rb') as f:
+                entry = _json_loads(f.read())
+        except (OSError, ValueError):
+            return None
+
+        # Mark as recently used for LRU eviction
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def _write_cache(self, url: str, body: str, etag: Optional[str]):
+        """Store response body and ETag; cache failures are non-fatal."""
+        if not self.use_cache:
+            return
+        path = self._cache_path(url)
+        entry = {'url': url, 'etag': etag, 'fetched_at': time.time(), 'body': body}
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        self._account_cache_write(len(body))
+
+    def _account_cache_write(self, size: int):
+        """Prune on the first write, then whenever a tenth of the cap has been written."""
+        with self._cache_lock:
+            if self._cache_written is not None:
+                self._cache_written += size
+                if self._cache_written < self.CACHE_MAX_BYTES // 10:
+                    return
+            self._cache_written = 0
+            self._prune_cache()
+
+    def _prune_cache(self):
+        """Evict least recently used cache files until the cache fits CACHE_MAX_BYTES."""
+        files = []
+        try:
+            with os.scandir(self.CACHE_DIR) as it:
+                for entry in it:
+                    if entry.is_file():
+                        stat = entry.stat()
+                        files.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return
+
+        total = sum(size for _, size, _ in files)
+        if total <= self.CACHE_MAX_BYTES:
+            return
+        for _, size, path in sorted(files):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+            if total <= self.CACHE_MAX_BYTES:
+                break
+
     def _fetch_url(self, url: str, is_api: bool = False) -> Any:
-        """Fetch URL content with error handling."""
+        """Fetch URL content over a pooled keep-alive connection, using the on-disk cache."""
+        cached = self._read_cache(url)
+        if cached is not None:
+            age = time.time() - cached.get('fetched_at', 0)
+            if self._is_immutable(url) or age < self.CACHE_TTL:
+                return _json_loads(cached['body']) if is_api else cached['body']
+
+        body = self._request_url(url, is_api, cached)
+        if body is None:
+            return None
+        return _json_loads(body) if is_api else body
+
+    def _request_url(self, url: str, is_api: bool,
+                     cached: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Perform the HTTP request, revalidating any cached entry; returns body text."""
+        request_url = url
+        headers = {'User-Agent': self.USER_AGENT}
+        if is_api:
+            headers['Accept'] = 'application/json'
+        if cached and cached.get('etag'):
+            headers['If-None-Match'] = cached['etag']
+        # Authenticated API requests get a higher rate limit, and their 304s are free
+        auth_headers = {**headers, 'Authorization': f"bearer {self.token}"} if is_api and self.token else headers
+
         try:
-            headers = {'Accept': 'application/json'} if is_api else {}
-            req = urllib.request.Request(url, headers=headers)
-            with urllib.request.urlopen(req, timeout=10) as response:
-                content = response.read()
-                return json.loads(content) if is_api else content.decode('utf-8')
-        except urllib.error.HTTPError as e:
-            if e.code == 404:
-                return None
-            raise RuntimeError(f"HTTP {e.code}: {e.reason} - {url}")
+            # Follow redirects (e.g. renamed repositories) manually
+            for _ in range(self.MAX_REDIRECTS + 1):
+                # Never send the token to a redirect target outside the API host
+                request_headers = auth_headers if request_url.startswith(f"{self.API_URL_BASE}/") else headers
+                status, reason, response_headers, content = self._pool.request('GET', request_url, request_headers)
+                location = response_headers.get('Location') or response_headers.get('location')
+                if status in (301, 302, 303, 307, 308) and location:
+                    request_url = urljoin(request_url, location)
+                    continue
+                break
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch {request_url}: {str(e)}")
+
+        if status == 304 and cached:
+            # Not modified: refresh timestamp and serve cached body
+            self._write_cache(url, cached['body'], cached.get('etag'))
+            return cached['body']
+        if status == 404:
+            return None
+        if status >= 300:
+            raise RuntimeError(f"HTTP {status}: {reason} - {request_url}")
+
+        try:
+            body = content.decode('utf-8')
         except Exception as e:
-            raise RuntimeError(f"Failed to fetch {url}: {str(e)}")
+            raise RuntimeError(f"Failed to fetch {request_url}: {str(e)}")
+
+        etag = response_headers.get('ETag') or response_headers.get('etag')
+        self._write_cache(url, body, etag)
+        return body
+
+    def _post_graphql(self, query: str, variables: Dict[str, Any]) -> Dict[str, Any]:
+        """POST a GraphQL query with the configured token and return its data."""
+        headers = {
+            'User-Agent': self.USER_AGENT,
+            'Authorization': f"bearer {self.token}",
+            'Content-Type': 'application/json',
+            'Accept': 'application/json'
+        }
+        payload = json.dumps({'query': query, 'variables': variables}).encode('utf-8')
+
+        try:
+            status, reason, _, content = self._pool.request('POST', self.GRAPHQL_URL, headers, payload)
+            result = _json_loads(content) if status < 300 else None
+        except Exception as e:
+            raise RuntimeError(f"Failed to fetch {self.GRAPHQL_URL}: {str(e)}")
+
+        if result is None:
+            raise RuntimeError(f"HTTP {status}: {reason} - {self.GRAPHQL_URL}")
+        if result.get('errors') or not result.get('data'):
+            messages = '; '.join(err.get('message', '') for err in result.get('errors') or [])
+            raise RuntimeError(f"GraphQL error: {messages or 'no data'}")
+        return result['data']
+
+    def fetch_files_batched(self, paths: List[str]) -> Dict[str, str]:
+        """
+        Fetch several files with one GitHub GraphQL request per batch.
+
+        Requires a token in GITHUB_TOKEN or GH_TOKEN. Missing and binary files
+        are omitted; files too large for GraphQL are fetched via raw URL.
+
+        Returns:
+            Dictionary mapping file path to content
+        """
+        return dict(self.iter_files_batched(paths))
+
+    def iter_files_batched(self, paths: List[str]) -> Iterator[Tuple[str, str]]:
+        """Like fetch_files_batched(), but yield (path, content) pairs one batch at a time."""
+        if not self.token:
+            raise RuntimeError("Batched fetch requires GITHUB_TOKEN or GH_TOKEN")
+
+        for start in range(0, len(paths), self.GRAPHQL_BATCH_SIZE):
+            batch = paths[start:start + self.GRAPHQL_BATCH_SIZE]
+            variables = {'owner': self.owner, 'name': self.repo}
+            params = []
+            fields = []
+            for i, path in enumerate(batch):
+                variables[f"e{i}"] = f"{self.resolve_branch()}:{path}"
+                params.append(f", $e{i}: String!")
+                fields.append(f"f{i}: object(expression: $e{i}) {{ ... on Blob {{ text isTruncated }} }}")
+
+            query = (f"query($owner: String!, $name: String!{''.join(params)}) "
+                     f"{{ repository(owner: $owner, name: $name) {{ {' '.join(fields)} }} }}")
+            repository = self._post_graphql(query, variables).get('repository')
+            if repository is None:
+                raise RuntimeError(f"Could not access {self.owner}/{self.repo} via GraphQL")
+
+            for i, path in enumerate(batch):
+                blob = repository.get(f"f{i}") or {}
+                content = self.fetch_file_content(path) if blob.get('isTruncated') else blob.get('text')
+                if content:
+                    yield path, content
+
+    def resolve_branch(self) -> str:
+        """Return the branch to read, looking up the repo's default branch if none was given."""
+        if self.branch is None:
+            url = f"{self.API_URL_BASE}/repos/{self.owner}/{self.repo}"
+            info = self._fetch_url(url, is_api=True)
+            if not info:
+                raise RuntimeError(f"Repository not found: {self.owner}/{self.repo}")
+            self.branch = info.get('default_branch') or 'main'
+        return self.branch
 
     def fetch_tree_structure(self) -> Dict[str, Any]:
         """Fetch repository tree structure via API."""
-        # Try main branch first, fall back to master
-        for branch in [self.branch, "master", "main"]:
-            url = f"{self.API_URL_BASE}/repos/{self.owner}/{self.repo}/git/trees/{branch}?recursive=1"
-            tree = self._fetch_url(url, is_api=True)
-            if tree:
-                self.branch = branch  # Update to working branch
-                return tree
+        branch = self.resolve_branch()
+        url = f"{self.API_URL_BASE}/repos/{self.owner}/{self.repo}/git/trees/{branch}?recursive=1"
+        tree = self._fetch_url(url, is_api=True)
+        if not tree:
+            raise RuntimeError(f"Could not fetch tree for {self.owner}/{self.repo} (branch '{branch}')")
+
+        if tree.get('truncated'):
+            self._warn_truncated()
+        return tree
+
+    def _warn_truncated(self):
+        """Report that GitHub truncated a recursive tree listing."""
+        print(f"Warning: GitHub truncated the tree for {self.owner}/{self.repo}; "
+              f"file counts and listings are incomplete", file=sys.stderr)
+
+    @staticmethod
+    def _contents_entry(item: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a Contents API item to a git tree entry."""
+        item_type = {'dir': 'tree', 'submodule': 'commit'}.get(item['type'], 'blob')
+        return {'path': item['path'], 'type': item_type}
+
+    def _fetch_contents(self, path: str = '') -> Optional[List[Dict[str, Any]]]:
+        """List one directory via the Contents API."""
+        url = f"{self.API_URL_BASE}/repos/{self.owner}/{self.repo}/contents"
+        if path:
+            url += f"/{path}"
+        url += f"?ref={self.resolve_branch()}"
+        return self._fetch_url(url, is_api=True)
+
+    def _fetch_subtree(self, path: str, sha: str) -> List[Dict[str, Any]]:
+        """Fetch all entries below a directory, with paths relative to the repo root."""
+        url = f"{self.API_URL_BASE}/repos/{self.owner}/{self.repo}/git/trees/{sha}?recursive=1"
+        subtree = self._fetch_url(url, is_api=True) or {}
+        if subtree.get('truncated'):
+            self._warn_truncated()
+        return [{'path': f"{path}/{entry['path']}", 'type': entry['type']}
+                for entry in subtree.get('tree', [])]
+
+    def fetch_tree_shallow(self) -> Dict[str, Any]:
+        """
+        Fetch a partial tree: top-level entries plus complete example directories.
 
-        raise RuntimeError(f"Could not fetch tree for {self.owner}/{self.repo}")
+        Downloads kilobytes instead of the full recursive tree on large monorepos.
+        Returns the same shape as fetch_tree_structure(), marked truncated since
+        nested files outside example directories are omitted.
+        """
+        root = self._fetch_contents()
+        if not root:
+            raise RuntimeError(f"Could not fetch contents for {self.owner}/{self.repo} (branch '{self.branch}')")
+
+        entries = [self._contents_entry(item) for item in root]
+        # Parents of nested priority dirs such as "docs/examples"
+        nested_parents = {p.split('/', 1)[0] for p in self.PRIORITY_DIRS if '/' in p}
+
+        for item in root:
+            if item['type'] != 'dir':
+                continue
+            name = item['name'].lower()
+            if name in self.PRIORITY_DIRS:
+                entries.extend(self._fetch_subtree(item['path'], item['sha']))
+            elif name in nested_parents:
+                for child in self._fetch_contents(item['path']) or []:
+                    entries.append(self._contents_entry(child))
+                    if child['type'] == 'dir' and (child['name'].lower() in self.PRIORITY_DIRS or
+                                                   child['path'].lower() in self.PRIORITY_DIRS):
+                        entries.extend(self._fetch_subtree(child['path'], child['sha']))
+
+        return {'tree': entries, 'truncated': True}
 
     def fetch_file_content(self, file_path: str) -> Optional[str]:
         """Fetch single file content via raw GitHub URL."""
-        url = f"{self.RAW_URL_BASE}/{self.owner}/{self.repo}/{self.branch}/{file_path}"
+        url = f"{self.RAW_URL_BASE}/{self.owner}/{self.repo}/{self.resolve_branch()}/{file_path}"
         return self._fetch_url(url)
 
+    def _tree_entries(self, tree: Dict[str, Any]) -> List[tuple]:
+        """
+        Split every tree path once and share the result across tree passes.
+
+        Returns:
+            List of (path, type, parts, skipped) tuples, cached per tree
+        """
+        if self._entries_cache is not None and self._entries_cache[0] is tree:
+            return self._entries_cache[1]
+
+        skip_dirs = self.SKIP_DIRS
+        entries = []
+        for item in tree.get('tree', []):
+            path = item['path']
+            parts = path.split('/')
+            entries.append((path, item['type'], parts, not skip_dirs.isdisjoint(parts)))
+
+        self._entries_cache = (tree, entries)
+        return entries
+
     def analyze_tree(self, tree: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze tree structure and categorize files."""
-        files = tree.get('tree', [])
 
         analysis = {
             'total_files': 0,
@@ -103,43 +519,44 @@ class GitHubRepoFetcher:
             'key_files': [],
             'example_files': [],
             'main_dirs': set(),
-            'has_examples': False
+            'has_examples': False,
+            'truncated': bool(tree.get('truncated'))
         }
 
-        for item in files:
-            path = item['path']
-            item_type = item['type']
+        priority_dirs = self.PRIORITY_DIRS
+        key_files = frozenset(self.KEY_FILES)
 
+        for path, item_type, parts, skipped in self._tree_entries(tree):
             # Skip unwanted directories
-            if any(skip_dir in path.split('/') for skip_dir in self.SKIP_DIRS):
+            if skipped:
                 continue
 
+            is_example = not priority_dirs.isdisjoint(path.lower().split('/'))
+
             if item_type == 'tree':
                 analysis['total_dirs'] += 1
                 # Track top-level directories
-                top_dir = path.split('/')[0]
-                analysis['main_dirs'].add(top_dir)
+                analysis['main_dirs'].add(parts[0])
 
                 # Check for example directories
-                if any(priority_dir in path.lower().split('/') for priority_dir in self.PRIORITY_DIRS):
+                if is_example:
                     analysis['has_examples'] = True
 
             elif item_type == 'blob':
                 analysis['total_files'] += 1
 
                 # Detect language by extension
-                ext = Path(path).suffix
+                filename = parts[-1]
+                ext = _suffix(filename)
                 if ext:
                     analysis['languages'][ext] = analysis['languages'].get(ext, 0) + 1
 
                 # Track key files
-                filename = Path(path).name
-                if filename in self.KEY_FILES or path in self.KEY_FILES:
+                if filename in key_files or path in key_files:
                     analysis['key_files'].append(path)
 
                 # Track example files (prioritize these for understanding usage)
-                path_parts = path.lower().split('/')
-                if any(priority_dir in path_parts for priority_dir in self.PRIORITY_DIRS):
+                if is_example:
                     analysis['example_files'].append(path)
 
         analysis['main_dirs'] = sorted(analysis['main_dirs'])
@@ -165,7 +582,7 @@ class GitHubRepoFetcher:
         non_matching = []
 
         for file_path in example_files:
-            ext = Path(file_path).suffix
+            ext = _suffix(file_path.rpartition('/')[2])
             if ext in context_extensions:
                 matching.append(file_path)
             else:
@@ -175,53 +592,83 @@ class GitHubRepoFetcher:
         return matching + non_matching
 
     def fetch_key_files(self, key_file_paths: List[str], max_files: int = 10) -> Dict[str, str]:
-        """Fetch content of key files."""
+        """Fetch content of key files concurrently, preserving input order."""
         contents = {}
-
-        for i, file_path in enumerate(key_file_paths[:max_files]):
-            content = self.fetch_file_content(file_path)
-            if content:
-                contents[file_path] = content
+        paths = key_file_paths[:max_files]
+        if not paths:
+            return contents
+
+        # One GraphQL round-trip when authenticated, else parallel raw downloads
+        if self.token:
+            try:
+                batched = self.fetch_files_batched(paths)
+                return {path: batched[path] for path in paths if path in batched}
+            except RuntimeError:
+                pass
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(paths))) as executor:
+            results = executor.map(self.fetch_file_content, paths)
+            for file_path, content in zip(paths, results):
+                if content:
+                    contents[file_path] = content
 
         return contents
 
+    def iter_file_contents(self, file_paths: List[str], max_files: int = 10) -> Iterator[Tuple[str, str]]:
+        """Yield (path, content) pairs as each download completes; missing files are skipped."""
+        paths = list(dict.fromkeys(file_paths[:max_files]))
+        if not paths:
+            return
+
+        if self.token:
+            streamed = set()
+            try:
+                for path, content in self.iter_files_batched(paths):
+                    streamed.add(path)
+                    yield path, content
+                return
+            except RuntimeError:
+                # Fall back to raw downloads for files not streamed yet
+                paths = [path for path in paths if path not in streamed]
+                if not paths:
+                    return
+
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(paths))) as executor:
+            futures = {executor.submit(self.fetch_file_content, path): path for path in paths}
+            for future in as_completed(futures):
+                # Drop the finished future so its content can be freed once written
+                path = futures.pop(future)
+                content = future.result()
+                if content:
+                    yield path, content
+
     def search_files_by_pattern(self, tree: Dict[str, Any], pattern: str) -> List[str]:
         """Search for files matching a pattern in the tree."""
-        files = tree.get('tree', [])
         matching = []
 
         regex = re.compile(pattern, re.IGNORECASE)
 
-        for item in files:
-            if item['type'] == 'blob':
-                path = item['path']
-                # Skip unwanted directories
-                if any(skip_dir in path.split('/') for skip_dir in self.SKIP_DIRS):
-                    continue
+        # Common "--files '.*\.py$'" filters reduce to a case-insensitive endswith
+        literal_suffixes = _extract_literal_suffixes(pattern)
 
-                if regex.search(path):
+        for path, item_type, _, skipped in self._tree_entries(tree):
+            # Skip unwanted directories
+            if item_type == 'blob' and not skipped:
+                if literal_suffixes is not None:
+                    if path.lower().endswith(literal_suffixes):
+                        matching.append(path)
+                elif regex.search(path):
                     matching.append(path)
 
         return matching
 
-    def fetch_repo(self, query: Optional[str] = None, specific_files: Optional[List[str]] = None,
-                   max_files: int = 10, prioritize_examples: bool = True,
-                   context_extensions: Optional[List[str]] = None) -> Dict[str, Any]:
-        """
-        Main entry point: Fetch repository with intelligent file selection.
-
-        Args:
-            query: Optional search query to find relevant files
-            specific_files: Optional list of specific file paths to fetch
-            max_files: Maximum number of files to fetch
-            prioritize_examples: If True, prioritize example/demo files (default: True)
-            context_extensions: File extensions from current project for context filtering
-
-        Returns:
-            Structured JSON with repo info and file contents
-        """
-        # Fetch tree structure
-        tree = self.fetch_tree_structure()
+    def _plan_fetch(self, query: Optional[str], specific_files: Optional[List[str]],
+                    max_files: int, prioritize_examples: bool,
+                    context_extensions: Optional[List[str]],
+                    shallow: bool) -> Tuple[Dict[str, Any], List[str]]:
+        """Analyze the tree and pick files; returns (response without contents, files to fetch)."""
+        # Fetch tree structure (a query needs every path, so shallow only applies without one)
+        tree = self.fetch_tree_shallow() if shallow and not query else self.fetch_tree_structure()
         analysis = self.analyze_tree(tree)
 
         # Determine which files to fetch
@@ -251,10 +698,7 @@ class GitHubRepoFetcher:
                 matching = self.search_files_by_pattern(tree, query)
                 files_to_fetch.extend(matching[:max_files - len(files_to_fetch)])
 
-        # Fetch file contents
-        file_contents = self.fetch_key_files(files_to_fetch, max_files)
-
-        # Build response
+        # Build response (file contents are filled in by the caller)
         response = {
             'repo': f"{self.owner}/{self.repo}",
             'url': self.repo_url,
@@ -265,11 +709,12 @@ class GitHubRepoFetcher:
                 'languages': analysis['languages'],
                 'main_directories': analysis['main_dirs'],
                 'has_examples': analysis['has_examples'],
-                'example_count': len(analysis['example_files'])
+                'example_count': len(analysis['example_files']),
+                'truncated': analysis['truncated']
             },
-            'fetched_files': list(file_contents.keys()),
+            'fetched_files': [],
             'available_examples': analysis['example_files'][:20],  # Show first 20 example files
-            'file_contents': file_contents
+            'file_contents': {}
         }
 
         # Add context filtering info if used
@@ -277,11 +722,65 @@ class GitHubRepoFetcher:
             response['context_filter'] = {
                 'enabled': True,
                 'extensions': context_extensions,
-                'matched_examples': sum(1 for f in files_to_fetch if Path(f).suffix in context_extensions)
+                'matched_examples': sum(1 for f in files_to_fetch if _suffix(f.rpartition('/')[2]) in context_extensions)
             }
 
+        return response, files_to_fetch
+
+    def fetch_repo(self, query: Optional[str] = None, specific_files: Optional[List[str]] = None,
+                   max_files: int = 10, prioritize_examples: bool = True,
+                   context_extensions: Optional[List[str]] = None,
+                   shallow: bool = False) -> Dict[str, Any]:
+        """
+        Main entry point: Fetch repository with intelligent file selection.
+
+        Args:
+            query: Optional search query to find relevant files
+            specific_files: Optional list of specific file paths to fetch
+            max_files: Maximum number of files to fetch
+            prioritize_examples: If True, prioritize example/demo files (default: True)
+            context_extensions: File extensions from current project for context filtering
+            shallow: If True and no query is given, list only top-level entries and
+                     example directories instead of the full recursive tree
+
+        Returns:
+            Structured JSON with repo info and file contents
+        """
+        response, files_to_fetch = self._plan_fetch(query, specific_files, max_files,
+                                                    prioritize_examples, context_extensions, shallow)
+
+        # Fetch file contents
+        file_contents = self.fetch_key_files(files_to_fetch, max_files)
+        response['fetched_files'] = list(file_contents.keys())
+        response['file_contents'] = file_contents
+
         return response
 
+    def stream_repo(self, query: Optional[str] = None, specific_files: Optional[List[str]] = None,
+                    max_files: int = 10, prioritize_examples: bool = True,
+                    context_extensions: Optional[List[str]] = None,
+                    shallow: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Like fetch_repo(), but yield records so file contents never accumulate in memory.
+
+        Yields:
+            The fetch_repo() response without 'fetched_files'/'file_contents', then
+            one {'path', 'content'} record per file as it arrives, then a final
+            {'fetched_files': [...]} record
+        """
+        response, files_to_fetch = self._plan_fetch(query, specific_files, max_files,
+                                                    prioritize_examples, context_extensions, shallow)
+        del response['fetched_files']
+        del response['file_contents']
+        yield response
+
+        fetched = []
+        for path, content in self.iter_file_contents(files_to_fetch, max_files):
+            fetched.append(path)
+            yield {'path': path, 'content': content}
+
+        yield {'fetched_files': fetched}
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -300,48 +799,67 @@ Examples:
 
   # Limit number of files fetched
   fetch_repo.py https://github.com/owner/repo --query "config" --max-files 5
+
+  # Stream file contents as JSON Lines while they download
+  fetch_repo.py https://github.com/owner/repo --stream
+
+  # Overview of a huge monorepo without downloading the full tree
+  fetch_repo.py https://github.com/owner/repo --tree-only --shallow
         '''
     )
 
     parser.add_argument('url', help='GitHub repository URL')
-    parser.add_argument('--branch', default='main', help='Branch to fetch (default: main)')
+    parser.add_argument('--branch', help="Branch to fetch (default: the repository's default branch)")
     parser.add_argument('--query', '-q', help='Search pattern to find relevant files')
     parser.add_argument('--files', '-f', nargs='+', help='Specific files to fetch')
     parser.add_argument('--max-files', type=int, default=10, help='Maximum files to fetch (default: 10)')
     parser.add_argument('--tree-only', action='store_true', help='Only fetch tree structure, no file contents')
+    parser.add_argument('--shallow', action='store_true',
+                        help='List only top-level entries and example directories (for very large repos; ignored with --query)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Emit JSON Lines (header, one record per file as it downloads, trailer)')
     parser.add_argument('--no-examples', action='store_true', help='Skip prioritizing example files')
     parser.add_argument('--context', help='File extensions to prioritize (e.g., ".py,.tsx") or "auto" to detect from current dir')
     parser.add_argument('--context-dir', default='.', help='Directory to detect context from (default: current directory)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk response cache (~/.cache/github-reader)')
 
     args = parser.parse_args()
 
     try:
-        fetcher = GitHubRepoFetcher(args.url, args.branch)
+        fetcher = GitHubRepoFetcher(args.url, args.branch, use_cache=not args.no_cache)
 
         # Determine context extensions if requested
         context_extensions = None
         if args.context:
             if args.context.lower() == 'auto':
                 # Auto-detect from current directory
-                try:
-                    from detect_context import ProjectContextDetector
-                    detector = ProjectContextDetector(args.context_dir)
-                    context_extensions = detector.get_relevant_extensions()
-                except ImportError:
-                    print("Warning: Could not import detect_context, skipping auto-detection", file=sys.stderr)
+                detector = ProjectContextDetector(args.context_dir)
+                context_extensions = detector.get_relevant_extensions()
             else:
                 # Parse comma-separated extensions
                 context_extensions = [ext.strip() for ext in args.context.split(',')]
 
         if args.tree_only:
             # Only fetch and analyze tree
-            tree = fetcher.fetch_tree_structure()
+            tree = fetcher.fetch_tree_shallow() if args.shallow else fetcher.fetch_tree_structure()
             analysis = fetcher.analyze_tree(tree)
             result = {
                 'repo': f"{fetcher.owner}/{fetcher.repo}",
                 'branch': fetcher.branch,
                 'summary': analysis
             }
+        elif args.stream:
+            # JSON Lines: header, one record per file as it downloads, trailer
+            for record in fetcher.stream_repo(
+                query=args.query,
+                specific_files=args.files,
+                max_files=args.max_files,
+                prioritize_examples=not args.no_examples,
+                context_extensions=context_extensions,
+                shallow=args.shallow
+            ):
+                write_json(record, indent=False)
+            return
         else:
             # Full fetch with file contents
             result = fetcher.fetch_repo(
@@ -349,11 +867,12 @@ Examples:
                 specific_files=args.files,
                 max_files=args.max_files,
                 prioritize_examples=not args.no_examples,
-                context_extensions=context_extensions
+                context_extensions=context_extensions,
+                shallow=args.shallow
             )
 
         # Output JSON
-        print(json.dumps(result, indent=2))
+        write_json(result)
 
     except Exception as e:
         print(json.dumps({'error': str(e)}), file=sys.stderr)
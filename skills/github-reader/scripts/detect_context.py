@@ -11,7 +11,13 @@ Analyzes the current working directory to determine:
 import os
 import json
 from pathlib import Path
-from typing import Dict, List, Set
+from typing import Dict, Iterator, List, Set
+
+
+def _suffix(name: str) -> str:
+    """Return file extension of a base name, matching pathlib's PurePath.suffix."""
+    i = name.rfind('.')
+    return name[i:] if 0 < i < len(name) - 1 else ''
 
 
 class ProjectContextDetector:
@@ -71,6 +77,12 @@ class ProjectContextDetector:
         }
     }
 
+    # Directories never scanned for source files
+    IGNORE_DIRS = frozenset({
+        'node_modules', 'venv', '.venv', 'dist', 'build',
+        '.git', '__pycache__', 'target', 'vendor'
+    })
+
     # Framework-specific patterns in package.json
     FRAMEWORK_PATTERNS = {
         'react': ['react', 'react-dom', 'next'],
@@ -88,6 +100,12 @@ class ProjectContextDetector:
         """Initialize detector with project directory."""
         self.project_dir = Path(project_dir).resolve()
 
+        # Reverse map: extension -> languages (.tsx is both typescript and react)
+        self._ext_to_langs: Dict[str, List[str]] = {}
+        for lang, indicators in self.LANGUAGE_INDICATORS.items():
+            for ext in indicators.get('extensions', []):
+                self._ext_to_langs.setdefault(ext, []).append(lang)
+
     def detect_languages(self, max_depth: int = 3) -> Set[str]:
         """
         Detect languages used in project.
@@ -107,27 +125,40 @@ class ProjectContextDetector:
                     detected.add(lang)
 
         # Scan for source files (limited depth)
-        for root, dirs, files in os.walk(self.project_dir):
-            # Calculate depth
-            depth = len(Path(root).relative_to(self.project_dir).parts)
-            if depth > max_depth:
-                continue
-
-            # Skip common ignore directories
-            dirs[:] = [d for d in dirs if d not in {
-                'node_modules', 'venv', '.venv', 'dist', 'build',
-                '.git', '__pycache__', 'target', 'vendor'
-            }]
+        all_languages = set(self.LANGUAGE_INDICATORS)
+        for name in self._walk_files(str(self.project_dir), 0, max_depth):
+            # Nothing left to find
+            if detected >= all_languages:
+                break
 
             # Check file extensions
-            for file in files:
-                ext = Path(file).suffix
-                for lang, indicators in self.LANGUAGE_INDICATORS.items():
-                    if ext in indicators.get('extensions', []):
-                        detected.add(lang)
+            langs = self._ext_to_langs.get(_suffix(name))
+            if langs:
+                detected.update(langs)
 
         return detected
 
+    def _walk_files(self, path: str, depth: int, max_depth: int) -> Iterator[str]:
+        """Yield file names up to max_depth, skipping IGNORE_DIRS and symlinked dirs."""
+        try:
+            with os.scandir(path) as entries:
+                subdirs = []
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    if not is_dir:
+                        yield entry.name
+                    elif depth < max_depth and entry.name not in self.IGNORE_DIRS and not entry.is_symlink():
+                        subdirs.append(entry.path)
+        except OSError:
+            return
+
+        # Files first, then subdirectories (same order as os.walk's top-down walk)
+        for subdir in subdirs:
+            yield from self._walk_files(subdir, depth + 1, max_depth)
+
     def detect_frameworks(self) -> Set[str]:
         """
         Detect frameworks used in project.
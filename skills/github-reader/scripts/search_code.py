@@ -10,17 +10,261 @@ import argparse
 import json
 import sys
 import re
-from typing import List, Dict, Any
-from fetch_repo import GitHubRepoFetcher
+import threading
+from bisect import bisect_right
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Iterator, Optional, Pattern, Tuple
+from fetch_repo import GitHubRepoFetcher, write_json
+
+# Extensions searched when no file pattern is given (skip binary and config)
+CODE_EXTENSIONS = ('.py', '.js', '.ts', '.go', '.java', '.rb', '.rs', '.c', '.cpp', '.h', '.php', '.jsx', '.tsx')
+
+# Patterns that can neither consume a newline nor see past one (no negated sets,
+# \s/\W/\D, inline flags, \A/\Z or lookaround), so a whole-buffer scan does the
+# same work and finds the same lines as searching each line separately
+LINE_BOUNDED = re.compile(r"""
+    (?: [^\\\[\]()\n]                                        # literals and . * + ? { } | ^ $
+      | \\[wdSbB] | \\[^\w\s]                                 # safe class escapes, escaped punctuation
+      | \[(?!\^)(?:[^\\\]\x00-\x1f]|\\[wdS]|\\[^\w\s])+\]   # positive sets of printable characters
+      | \((?!\?) | \(\?: | \(\?P<\w+> | \)                  # plain, non-capturing and named groups
+    )+
+""", re.VERBOSE)
+
+# Syntax RE2 accepts but reads differently from re: "{,n}" is literal in RE2,
+# "[[:alpha:]]" is a POSIX class in RE2 but a plain set in re
+RE2_DIVERGENT = re.compile(r'\{,|\[:\^?[a-z]+:\]')
+
+# Characters that make a pattern more than a plain literal
+REGEX_METACHARS = frozenset('.^$*+?{}[]\\|()')
+
+# Optional: RE2 (pip install google-re2) gives linear-time matching on untrusted patterns
+try:
+    import re2
+except ImportError:
+    re2 = None
+
+# Optional: Hyperscan (pip install hyperscan) prefilters files with a SIMD scan
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
+
+class _HyperscanPrefilter:
+    """
+    Find candidate lines for a pattern with a single Hyperscan block scan.
+
+    Hyperscan reports every match end offset; the line holding each end offset
+    is a candidate. Candidates are confirmed with the regular engine, so its
+    semantics are preserved while non-matching files cost one C-level scan.
+    """
+
+    # Literals, escaped punctuation, '.', '.*'/'.+' and top-level '|' - the common
+    # "import requests" / "class.*Config" searches. Anchors, classes and repeats
+    # near newlines are left to the regex engine, where Hyperscan's results can
+    # differ from re.
+    LITERALISH = re.compile(r'(?:[\w \-:,\'"=<>/@#%&!~;]|\\[^\w\s]|\.[*+?]?|\|)+')
+
+    def __init__(self, pattern: str):
+        self.db = hyperscan.Database(mode=hyperscan.HS_MODE_BLOCK)
+        self.db.compile(
+            expressions=[pattern.encode('utf-8')],
+            ids=[0],
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_UTF8]
+        )
+        self._local = threading.local()
+
+    @classmethod
+    def create(cls, pattern: str) -> Optional['_HyperscanPrefilter']:
+        """Build a prefilter, or None if Hyperscan is unavailable or the pattern is unsuitable."""
+        # Non-ASCII patterns may case-fold differently from re; skip them
+        if hyperscan is None or not pattern.isascii() or not cls.LITERALISH.fullmatch(pattern):
+            return None
+        try:
+            # Hyperscan does not report empty matches like re does
+            if re.search(pattern, '', re.IGNORECASE) is not None:
+                return None
+            return cls(pattern)
+        except Exception:
+            return None
+
+    def candidate_lines(self, content: str) -> List[int]:
+        """Return sorted 0-based indices of lines that may contain a match."""
+        data = content.encode('utf-8')
+        ends = []
+        # Scratch space is not thread-safe; keep one per worker thread
+        scratch = getattr(self._local, 'scratch', None)
+        if scratch is None:
+            scratch = self._local.scratch = hyperscan.Scratch(self.db)
+        self.db.scan(data, match_event_handler=lambda _id, _from, to, _flags, _ctx: ends.append(to),
+                     scratch=scratch)
+        if not ends:
+            return []
+
+        # '\n' is a single byte in UTF-8, so byte line indices equal str line indices
+        line_starts = [0]
+        line_starts.extend(m.end() for m in re.finditer(b'\n', data))
+        # A match ending at offset `end` (empty or not) lies on the line holding `end`
+        return sorted({bisect_right(line_starts, end) - 1 for end in ends})
 
 
 class GitHubCodeSearcher:
     """Search for code patterns in GitHub repositories."""
 
-    def __init__(self, fetcher: GitHubRepoFetcher):
+    ENGINES = ('auto', 're2', 're')
+    MAX_MATCHES = 100  # Matches returned per search, for token efficiency
+
+    def __init__(self, fetcher: GitHubRepoFetcher, engine: str = 'auto'):
+        """
+        Initialize searcher.
+
+        Args:
+            fetcher: Repository fetcher used to download files
+            engine: Regex engine - 're2' (linear time), 're' (backtracking),
+                    or 'auto' (re2 when installed and the pattern is supported)
+        """
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown regex engine: {engine} (choose from {', '.join(self.ENGINES)})")
+        if engine == 're2' and re2 is None:
+            raise ValueError("Regex engine 're2' requested but google-re2 is not installed")
         self.fetcher = fetcher
+        self.engine = engine
+        self.engine_used = None
+        self.prefilter_used = None
+
+    def compile_prefilter(self, pattern: str) -> Optional[_HyperscanPrefilter]:
+        """Compile an optional Hyperscan prefilter for a search pattern."""
+        prefilter = _HyperscanPrefilter.create(pattern)
+        self.prefilter_used = 'hyperscan' if prefilter else None
+        return prefilter
+
+    def compile_pattern(self, pattern: str) -> Pattern:
+        """Compile a search pattern (case-insensitive, ^/$ anchor at line boundaries)."""
+        # Under 'auto', keep re semantics for syntax RE2 would silently reinterpret
+        if re2 is not None and (self.engine == 're2' or
+                                (self.engine == 'auto' and not RE2_DIVERGENT.search(pattern))):
+            options = re2.Options()
+            options.log_errors = False
+            try:
+                regex = re2.compile(f"(?im){pattern}", options)
+                self.engine_used = 're2'
+                return regex
+            except Exception as e:
+                # RE2 rejects backreferences and lookaround; fall back unless forced
+                if self.engine == 're2':
+                    reason = e.args[0].decode() if e.args and isinstance(e.args[0], bytes) else str(e)
+                    raise ValueError(f"Pattern not supported by re2: {reason}")
+
+        self.engine_used = 're'
+        return re.compile(pattern, re.IGNORECASE | re.MULTILINE)
+
+    def _matching_lines(self, content: str, regex: Pattern) -> Iterator[int]:
+        """Yield 0-based indices of lines matching regex, in order."""
+        # Offsets where each line starts, for mapping match positions to lines
+        line_starts = [0]
+        line_starts.extend(m.end() for m in re.finditer('\n', content))
+        content_len = len(content)
+
+        # Scan the whole buffer; resume after each matching line so every
+        # line is reported at most once (same results as a per-line search)
+        pos = 0
+        while pos <= content_len:
+            found = regex.search(content, pos)
+            if not found:
+                break
+
+            line_idx = bisect_right(line_starts, found.start()) - 1
+            line_start = line_starts[line_idx]
+            line_end = line_starts[line_idx + 1] - 1 if line_idx + 1 < len(line_starts) else content_len
+            pos = line_end + 1
+
+            # A match spanning a newline only counts if the line matches alone
+            if found.end() > line_end and not regex.search(content, line_start, line_end):
+                continue
+
+            yield line_idx
+
+    @staticmethod
+    def _literal_needle(pattern: str) -> Optional[str]:
+        """Return the lowercased pattern if it is a plain single-line ASCII literal, else None."""
+        # A newline would let str.find match across lines, which a per-line search cannot
+        if pattern and pattern.isascii() and '\n' not in pattern and REGEX_METACHARS.isdisjoint(pattern):
+            return pattern.lower()
+        return None
+
+    @staticmethod
+    def _literal_lines(content: str, needle: str) -> Iterator[int]:
+        """Yield 0-based indices of lines containing needle (ASCII, case-insensitive)."""
+        # str.find runs CPython's C fastsearch (Boyer-Moore-Horspool style)
+        haystack = content.lower()
+        line_idx = 0
+        scanned = 0
+        pos = haystack.find(needle)
+        while pos != -1:
+            line_idx += haystack.count('\n', scanned, pos)
+            yield line_idx
+
+            # Resume at the next line so each line is reported once
+            line_end = haystack.find('\n', pos)
+            if line_end == -1:
+                return
+            scanned = line_end + 1
+            line_idx += 1
+            pos = haystack.find(needle, scanned)
+
+    def _find_matching_lines(self, file_path: str, pattern: str,
+                             compiled: Optional[Pattern] = None,
+                             prefilter: Optional[_HyperscanPrefilter] = None
+                             ) -> Tuple[List[str], List[int], Optional[str]]:
+        """
+        Fetch a file and find its matching lines.
+
+        Returns:
+            Tuple of (lines, 0-based indices of matching lines, engine used or None if empty)
+        """
+        content = self.fetcher.fetch_file_content(file_path)
+        if not content:
+            return [], [], None
 
-    def search_in_file(self, file_path: str, pattern: str, context_lines: int = 3) -> List[Dict[str, Any]]:
+        lines = content.split('\n')
+
+        # Plain literals on ASCII text need no regex engine; lowercasing
+        # ASCII text matches re.IGNORECASE exactly and keeps offsets intact
+        needle = self._literal_needle(pattern)
+        if needle is not None and content.isascii():
+            return lines, list(self._literal_lines(content, needle)), 'literal'
+
+        regex = compiled or self.compile_pattern(pattern)
+
+        if prefilter is not None:
+            # Confirm each candidate line with the regex engine
+            indices = [idx for idx in prefilter.candidate_lines(content) if regex.search(lines[idx])]
+        elif isinstance(regex, re.Pattern) and LINE_BOUNDED.fullmatch(pattern):
+            indices = list(self._matching_lines(content, regex))
+        else:
+            # RE2 re-encodes the whole string on every search(content, pos), and
+            # matches that may span lines would backtrack over the whole file
+            indices = [idx for idx, line in enumerate(lines) if regex.search(line)]
+        return lines, indices, self.engine_used
+
+    @staticmethod
+    def _build_match(file_path: str, lines: List[str], line_idx: int, context_lines: int) -> Dict[str, Any]:
+        """Build a match entry with surrounding context lines."""
+        line_num = line_idx + 1
+        start_line = max(0, line_num - context_lines - 1)
+        end_line = min(len(lines), line_num + context_lines)
+
+        return {
+            'file': file_path,
+            'line': line_num,
+            'match': lines[line_idx].strip(),
+            'context_before': lines[start_line:line_num-1],
+            'context_after': lines[line_num:end_line]
+        }
+
+    def search_in_file(self, file_path: str, pattern: str, context_lines: int = 3,
+                       compiled: Optional[Pattern] = None,
+                       prefilter: Optional[_HyperscanPrefilter] = None) -> List[Dict[str, Any]]:
         """
         Search for pattern in a single file and return matches with context.
 
@@ -28,34 +272,14 @@ class GitHubCodeSearcher:
             file_path: Path to file in repository
             pattern: Regex pattern to search for
             context_lines: Number of lines before/after match to include
+            compiled: Optional pattern from compile_pattern() (skips recompiling per file)
+            prefilter: Optional prefilter from compile_prefilter() to locate candidate lines
 
         Returns:
             List of matches with line numbers and context
         """
-        content = self.fetcher.fetch_file_content(file_path)
-        if not content:
-            return []
-
-        lines = content.split('\n')
-        matches = []
-        regex = re.compile(pattern, re.IGNORECASE)
-
-        for line_num, line in enumerate(lines, start=1):
-            if regex.search(line):
-                # Extract context
-                start_line = max(0, line_num - context_lines - 1)
-                end_line = min(len(lines), line_num + context_lines)
-
-                context = {
-                    'file': file_path,
-                    'line': line_num,
-                    'match': line.strip(),
-                    'context_before': lines[start_line:line_num-1],
-                    'context_after': lines[line_num:end_line]
-                }
-                matches.append(context)
-
-        return matches
+        lines, line_indices, _ = self._find_matching_lines(file_path, pattern, compiled, prefilter)
+        return [self._build_match(file_path, lines, idx, context_lines) for idx in line_indices]
 
     def search_repository(self, pattern: str, file_pattern: str = None,
                          max_files: int = 20, context_lines: int = 3) -> Dict[str, Any]:
@@ -79,11 +303,10 @@ class GitHubCodeSearcher:
             files_to_search = self.fetcher.search_files_by_pattern(tree, file_pattern)
         else:
             # Search all code files (skip binary and config)
-            code_extensions = {'.py', '.js', '.ts', '.go', '.java', '.rb', '.rs', '.c', '.cpp', '.h', '.php', '.jsx', '.tsx'}
             files = tree.get('tree', [])
             files_to_search = [
                 item['path'] for item in files
-                if item['type'] == 'blob' and any(item['path'].endswith(ext) for ext in code_extensions)
+                if item['type'] == 'blob' and item['path'].endswith(CODE_EXTENSIONS)
             ]
 
         # Limit files to search
@@ -91,25 +314,51 @@ class GitHubCodeSearcher:
 
         # Search each file
         all_matches = []
+        total_matches = 0
         files_with_matches = set()
-
-        for file_path in files_to_search:
-            matches = self.search_in_file(file_path, pattern, context_lines)
-            if matches:
-                all_matches.extend(matches)
-                files_with_matches.add(file_path)
+        engines_used = set()
+
+        # Compile once for all files
+        regex = self.compile_pattern(pattern)
+        prefilter = self.compile_prefilter(pattern)
+
+        # Fetch and search files concurrently, then aggregate in input order
+        if files_to_search:
+            workers = min(self.fetcher.MAX_WORKERS, len(files_to_search))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = executor.map(
+                    lambda path: self._find_matching_lines(path, pattern, regex, prefilter),
+                    files_to_search
+                )
+                for file_path, (lines, line_indices, engine) in zip(files_to_search, results):
+                    if engine:
+                        engines_used.add(engine)
+                    if not line_indices:
+                        continue
+                    files_with_matches.add(file_path)
+                    total_matches += len(line_indices)
+
+                    # Only build context for matches that will be returned
+                    for line_idx in line_indices[:self.MAX_MATCHES - len(all_matches)]:
+                        all_matches.append(self._build_match(file_path, lines, line_idx, context_lines))
+
+        # Report the paths files actually took, e.g. "literal" or "literal+re2"
+        engine = '+'.join(sorted(engines_used, key=lambda name: name != 'literal')) or self.engine_used
+        prefilter_used = None if engines_used == {'literal'} else self.prefilter_used
 
         # Build results
         results = {
             'repo': f"{self.fetcher.owner}/{self.fetcher.repo}",
             'branch': self.fetcher.branch,
             'pattern': pattern,
+            'engine': engine,
+            'prefilter': prefilter_used,
             'statistics': {
                 'files_searched': len(files_to_search),
                 'files_with_matches': len(files_with_matches),
-                'total_matches': len(all_matches)
+                'total_matches': total_matches
             },
-            'matches': all_matches[:100]  # Limit to first 100 matches for token efficiency
+            'matches': all_matches
         }
 
         return results
@@ -129,21 +378,27 @@ Examples:
 
   # Search with custom context
   search_code.py https://github.com/owner/repo "class.*Config" --context 5
+
+  # Force the linear-time RE2 engine (pip install google-re2)
+  search_code.py https://github.com/owner/repo "(a+)+$" --engine re2
         '''
     )
 
     parser.add_argument('url', help='GitHub repository URL')
     parser.add_argument('pattern', help='Code pattern to search (regex)')
-    parser.add_argument('--branch', default='main', help='Branch to search (default: main)')
+    parser.add_argument('--branch', help="Branch to search (default: the repository's default branch)")
     parser.add_argument('--files', help='File pattern to limit search (regex)')
     parser.add_argument('--max-files', type=int, default=20, help='Maximum files to search (default: 20)')
     parser.add_argument('--context', type=int, default=3, help='Context lines around matches (default: 3)')
+    parser.add_argument('--engine', choices=GitHubCodeSearcher.ENGINES, default='auto',
+                        help='Regex engine: re2 (linear time, needs google-re2), re, or auto (default: auto)')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the on-disk response cache (~/.cache/github-reader)')
 
     args = parser.parse_args()
 
     try:
-        fetcher = GitHubRepoFetcher(args.url, args.branch)
-        searcher = GitHubCodeSearcher(fetcher)
+        fetcher = GitHubRepoFetcher(args.url, args.branch, use_cache=not args.no_cache)
+        searcher = GitHubCodeSearcher(fetcher, engine=args.engine)
 
         results = searcher.search_repository(
             pattern=args.pattern,
@@ -152,7 +407,7 @@ Examples:
             context_lines=args.context
         )
 
-        print(json.dumps(results, indent=2))
+        write_json(results)
 
     except Exception as e:
         print(json.dumps({'error': str(e)}), file=sys.stderr)